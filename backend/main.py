@@ -1,27 +1,68 @@
 """
 FastAPI JWT Authentication Backend
-Install dependencies: pip install fastapi uvicorn python-jose[cryptography] passlib[bcrypt] python-multipart mysql-connector-python pydantic-settings pytest httpx
+Install dependencies: pip install fastapi uvicorn pyjwt bcrypt cachetools orjson slowapi python-multipart asyncmy pydantic-settings pytest httpx
 """
 
+import asyncio
+import hashlib
+import hmac
+import logging
 import os
-from datetime import datetime, timedelta
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 
-import mysql
-import mysql.connector
-from fastapi import Depends, FastAPI, HTTPException, status
+import asyncmy
+import bcrypt
+import jwt
+import orjson
+from asyncmy.cursors import DictCursor
+from asyncmy.errors import Error, IntegrityError
+from asyncmy.pool import Pool
+from cachetools import TLRUCache, TTLCache
+from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from jose import JWTError, jwt
-from mysql.connector import Error
-from passlib.context import CryptContext
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import ORJSONResponse
+from fastapi.security import OAuth2PasswordRequestForm
+from jwt.algorithms import HMACAlgorithm
+from pydantic import BaseModel, field_validator
+from slowapi import Limiter
+from slowapi.errors import RateLimitExceeded
+from slowapi.util import get_remote_address
+
+# Logging (set LOG_LEVEL=DEBUG to trace the full token flow)
+LOG_LEVEL = (os.getenv("LOG_LEVEL") or "WARNING").upper()
+# getLevelName returns an int only for registered level names
+LOG_LEVEL_VALID = isinstance(logging.getLevelName(LOG_LEVEL), int)
+logging.basicConfig(level=LOG_LEVEL if LOG_LEVEL_VALID else "WARNING")
+logger = logging.getLogger("auth")
+if not LOG_LEVEL_VALID:
+    logger.warning("[APP] Unknown LOG_LEVEL %r, using WARNING", LOG_LEVEL)
 
 # JWT Configuration
 SECRET_KEY = "4567"  # Change this!
 ALGORITHM = "HS256"
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Password verification cache (opt-in): remembers bcrypt results for repeat logins
+PASSWORD_CACHE_ENABLED = os.getenv("PASSWORD_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+PASSWORD_CACHE_SIZE = 4096
+PASSWORD_CACHE_TTL_SECONDS = 300
+
+# Authenticated-user cache: token -> user, for at most 60s and never past token expiry
+TOKEN_CACHE_SIZE = 10_000
+TOKEN_CACHE_TTL_SECONDS = 60
+
+# Login throttling: per-IP request limit plus a per-username failed-attempt cap,
+# both checked before any bcrypt work is done
+LOGIN_RATE_LIMIT = "5/minute"
+MAX_FAILED_LOGINS = 5
+FAILED_LOGIN_WINDOW_SECONDS = 60
+FAILED_LOGIN_CACHE_SIZE = 10_000
+
 # Database Configuration
 DB_CONFIG = {
     "host": "localhost",
@@ -29,29 +70,120 @@ DB_CONFIG = {
     "password": "",  # Change this!
     "database": "auth_db"
 }
+DB_POOL_MIN_SIZE = 5
+DB_POOL_MAX_SIZE = 20
+DB_POOL_RECYCLE_SECONDS = 3600
+
+# Hot-path SQL; asyncmy has no server-side prepared statements
+SELECT_USER_BY_USERNAME_QUERY = (
+    "SELECT id, username, email, hashed_password FROM users WHERE username = %s LIMIT 1"
+)
+INSERT_USER_QUERY = "INSERT INTO users (username, email, hashed_password) VALUES (%s, %s, %s)"
+
+# Async connection pool, created on startup
+db_pool: Optional[Pool] = None
 
 # Initialize FastAPI
-app = FastAPI(title="JWT Auth API")
+app = FastAPI(title="JWT Auth API", default_response_class=ORJSONResponse)
+
+# Rate limiting
+limiter = Limiter(key_func=get_remote_address)
+app.state.limiter = limiter
+# slowapi logs every rejected request at WARNING; we log them at INFO instead
+logging.getLogger("slowapi").setLevel(logging.ERROR)
+
+async def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> ORJSONResponse:
+    """Return rate-limit errors in the API's usual {"detail": ...} shape"""
+    logger.info("[API] Rate limit exceeded on %s: %s", request.url.path, exc.detail)
+    return ORJSONResponse(
+        {"detail": f"Too many attempts, please try again later ({exc.detail})"},
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS
+    )
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173"],  # Vite default port
-    allow_methods=["*"],
-    allow_headers=["*"],
-    allow_credentials=True
+    # Explicit lists avoid the wildcard handling on every preflight
+    allow_methods=("GET", "POST", "OPTIONS"),
+    allow_headers=("authorization", "content-type"),
+    allow_credentials=True,
+    max_age=86400  # Let browsers cache preflight responses for a day
 )
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+BCRYPT_ROUNDS = 12
+# Dedicated workers for bcrypt, one per core, created on startup: bcrypt releases the
+# GIL while hashing, and keeping it off the default executor stops it starving other
+# threaded work (falls back to the default executor if the app hasn't started)
+pwd_executor: Optional[ThreadPoolExecutor] = None
+# Checked against for unknown usernames so every login pays the same bcrypt cost
+DUMMY_PASSWORD_HASH = bcrypt.hashpw(b"dummy-password", bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
+
+# Keyed by sha256(password | hash) so the raw password is never stored
+password_cache: TTLCache = TTLCache(maxsize=PASSWORD_CACHE_SIZE, ttl=PASSWORD_CACHE_TTL_SECONDS)
+password_cache_lock = threading.Lock()
+
+# Failed login count per casefolded username (the users table collation is
+# case-insensitive, so "bob" and "BOB" share one budget), forgotten after a quiet window
+failed_logins: TTLCache = TTLCache(maxsize=FAILED_LOGIN_CACHE_SIZE, ttl=FAILED_LOGIN_WINDOW_SECONDS)
+
+# JWT signing
+class HS256Algorithm(HMACAlgorithm):
+    """HS256 using the one-shot hmac.digest path and the precomputed secret"""
+
+    def __init__(self):
+        super().__init__(HMACAlgorithm.SHA256)
+
+    def prepare_key(self, key):
+        # Skip PyJWT's per-call key coercion and PEM checks for our own secret
+        if key is SECRET_KEY_BYTES:
+            return key
+        return super().prepare_key(key)
+
+    def sign(self, msg: bytes, key: bytes) -> bytes:
+        return hmac.digest(key, msg, "sha256")
+
+    def verify(self, msg: bytes, key: bytes, sig: bytes) -> bool:
+        return hmac.compare_digest(sig, hmac.digest(key, msg, "sha256"))
+
+# Registered under the literal name: the class always signs with SHA-256, so it must
+# not stand in for whatever ALGORITHM is configured to
+jwt.unregister_algorithm("HS256")
+jwt.register_algorithm("HS256", HS256Algorithm())
+
+# Values are (user, exp); entries expire at whichever comes first
+token_cache: TLRUCache = TLRUCache(
+    maxsize=TOKEN_CACHE_SIZE,
+    ttu=lambda _token, value, now: min(now + TOKEN_CACHE_TTL_SECONDS, value[1]),
+    # Resolve time.time on each call (not once at import) so the clock can be patched
+    timer=lambda: time.time(),
+)
 
 # Pydantic Models
+# Single compiled check instead of the multi-stage email-validator pipeline: the local
+# part is dot-separated atoms of RFC 5322 atext, the domain is non-empty labels
+EMAIL_PATTERN = re.compile(
+    r"[\w!#$%&'*+/=?^`{|}~-]+(?:\.[\w!#$%&'*+/=?^`{|}~-]+)*@(?:[^@\s.]+\.)+[^@\s.]+"
+)
+EMAIL_MAX_LENGTH = 100  # users.email is VARCHAR(100)
+
 class UserCreate(BaseModel):
     username: str
-    email: EmailStr
+    email: str
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def validate_email(cls, value: str) -> str:
+        if len(value) > EMAIL_MAX_LENGTH or EMAIL_PATTERN.fullmatch(value) is None:
+            raise ValueError("value is not a valid email address")
+        # Domains are case-insensitive; store them lowercased like EmailStr did
+        local_part, _, domain = value.rpartition("@")
+        return f"{local_part}@{domain.lower()}"
+
 class UserResponse(BaseModel):
     id: int
     username: str
@@ -65,24 +197,32 @@ class TokenData(BaseModel):
     username: Optional[str] = None
 
 # Database Functions
-def get_db_connection():
-    """Create database connection"""
-    try:
-        connection = mysql.connector.connect(**DB_CONFIG)
-        print(f"[DB] Connection established successfully")
-        return connection
-    except Error as e:
-        print(f"[DB] Error connecting to database: {e}")
+async def create_db_pool() -> Pool:
+    """Create the async connection pool"""
+    global db_pool
+    db_pool = await asyncmy.create_pool(
+        minsize=DB_POOL_MIN_SIZE,
+        maxsize=DB_POOL_MAX_SIZE,
+        # Recycle connections before the server's wait_timeout drops them
+        pool_recycle=DB_POOL_RECYCLE_SECONDS,
+        autocommit=True,
+        **DB_CONFIG
+    )
+    logger.info("[DB] Connection pool created (size=%d-%d)", DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE)
+    return db_pool
+
+def get_db_pool() -> Pool:
+    """Return the shared connection pool"""
+    if db_pool is None:
+        logger.error("[DB] Connection pool is not initialized")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Database connection failed"
         )
+    return db_pool
 
-def create_tables():
+async def create_tables():
     """Create users table if not exists"""
-    connection = get_db_connection()
-    cursor = connection.cursor()
-    
     create_table_query = """
     CREATE TABLE IF NOT EXISTS users (
         id INT AUTO_INCREMENT PRIMARY KEY,
@@ -94,223 +234,251 @@ def create_tables():
     """
     
     try:
-        cursor.execute(create_table_query)
-        connection.commit()
-        print("[DB] Users table created/verified successfully")
+        async with get_db_pool().acquire() as connection, connection.cursor() as cursor:
+            await cursor.execute(create_table_query)
+        logger.info("[DB] Users table created/verified successfully")
     except Error as e:
-        print(f"[DB] Error creating table: {e}")
-    finally:
-        cursor.close()
-        connection.close()
+        logger.error("[DB] Error creating table: %s", e)
 
 # Authentication Functions
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    result = pwd_context.verify(plain_password, hashed_password)
-    print(f"[AUTH] Password verification: {result}")
+    if not PASSWORD_CACHE_ENABLED:
+        result = bcrypt.checkpw(plain_password.encode("utf-8")[:72], hashed_password.encode("utf-8"))
+        logger.debug("[AUTH] Password verification: %s", result)
+        return result
+
+    key = hashlib.sha256(plain_password.encode() + b"|" + hashed_password.encode()).digest()
+    with password_cache_lock:
+        cached = password_cache.get(key)
+    if cached is not None:
+        logger.debug("[AUTH] Password verification (cached): %s", cached)
+        return cached
+
+    result = bcrypt.checkpw(plain_password.encode("utf-8")[:72], hashed_password.encode("utf-8"))
+    with password_cache_lock:
+        password_cache[key] = result
+    logger.debug("[AUTH] Password verification: %s", result)
     return result
 
 def get_password_hash(password: str) -> str:
-    """Hash password"""
-    password = password[:72]
-    return pwd_context.hash(password)
+    """Hash password (bcrypt only uses the first 72 bytes)"""
+    return bcrypt.hashpw(password.encode("utf-8")[:72], bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode("utf-8")
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+def create_access_token(data: dict, expires_seconds: int = 15 * 60):
     """Create JWT access token"""
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
+    # exp is a NumericDate: integer seconds since the epoch
+    expire = int(time.time()) + expires_seconds
     
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"[JWT] Token created for user: {data.get('sub')}")
-    print(f"[JWT] Token expires at: {expire}")
-    print(f"[JWT] Generated token: {encoded_jwt[:20]}...")
+    # Serialize the claims with orjson and sign them at the JWS layer directly
+    encoded_jwt = jwt.api_jws.encode(orjson.dumps(to_encode), SECRET_KEY_BYTES, algorithm=ALGORITHM)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[JWT] Token created for user: %s", data.get("sub"))
+        logger.debug("[JWT] Token expires at: %s", expire)
+        logger.debug("[JWT] Generated token: %s...", encoded_jwt[:20])
     return encoded_jwt
 
-def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
+async def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
     """Get user from database by username"""
-    connection = get_db_connection()
-    cursor = connection.cursor(dictionary=True)
-    
     try:
-        cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
-        user = cursor.fetchone()
-        # Ensure we return a plain dict to satisfy static type checkers
-        if user is None:
-            print(f"[DB] User lookup for '{username}': Not found")
-            return None
-        if isinstance(user, dict):
-            print(f"[DB] User lookup for '{username}': Found")
-            return user
-        # Fallback: convert a sequence row to a dict using column names provided by the cursor
-        column_names = getattr(cursor, "column_names", None) or []
-        if column_names and len(column_names) == len(user):
-            user_dict = dict(zip(column_names, user))
-            print(f"[DB] User lookup for '{username}': Found (converted to dict)")
-            return user_dict
-        # If we cannot map columns to values, log and return None
-        print(f"[DB] Unexpected row format for user '{username}': could not convert to dict")
-        return None
-    finally:
-        cursor.close()
-        connection.close()
-
-async def get_current_user(token: str = Depends(oauth2_scheme)):
-    """Validate JWT token and return current user"""
-    print(f"[JWT] Validating token: {token[:20]}...")
-    
+        async with get_db_pool().acquire() as connection, connection.cursor(DictCursor) as cursor:
+            await cursor.execute(SELECT_USER_BY_USERNAME_QUERY, (username,))
+            return await cursor.fetchone()
+    except Error as e:
+        logger.error("[DB] Error looking up user: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database connection failed"
+        )
+
+async def get_current_user(request: Request):
+    """Validate JWT token from the Authorization header and return current user"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
+    # Parse "Authorization: Bearer <token>" directly instead of going through OAuth2PasswordBearer
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        logger.info("[JWT] Missing or malformed Authorization header")
+        raise credentials_exception
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[JWT] Validating token: %s...", token[:20])
+    
+    cached = token_cache.get(token)
+    if cached is not None:
+        logger.debug("[AUTH] User authenticated from token cache: %s", cached[0]["username"])
+        return cached[0]
+    
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = jwt.decode(
+            token, SECRET_KEY_BYTES, algorithms=[ALGORITHM], options={"require": ["exp", "sub"]}
+        )
         username: Optional[str] = payload.get("sub")
-        print(f"[JWT] Token decoded successfully for user: {username}")
+        logger.debug("[JWT] Token decoded successfully for user: %s", username)
         
         if username is None:
-            print("[JWT] No username in token payload")
+            logger.info("[JWT] No username in token payload")
             raise credentials_exception
             
         token_data = TokenData(username=username)
-    except JWTError as e:
-        print(f"[JWT] Token validation error: {e}")
+    except jwt.InvalidTokenError as e:
+        logger.info("[JWT] Token validation error: %s", e)
         raise credentials_exception
 
     # Ensure username is a concrete str before calling DB function
     username = token_data.username
     if username is None:
-        print("[JWT] Token contained no username after decoding")
+        logger.info("[JWT] Token contained no username after decoding")
         raise credentials_exception
 
-    user = get_user_by_username(username=username)
+    user = await get_user_by_username(username=username)
     if user is None:
-        print(f"[JWT] User not found in database")
+        logger.info("[JWT] User not found in database")
         raise credentials_exception
     
-    print(f"[AUTH] User authenticated successfully: {username}")
+    token_cache[token] = (user, payload.get("exp") or time.time() + TOKEN_CACHE_TTL_SECONDS)
+    logger.debug("[AUTH] User authenticated successfully: %s", username)
     return user
 
 # API Endpoints
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
-    print("[APP] Starting application...")
-    create_tables()
+    """Initialize database and password workers on startup"""
+    global pwd_executor
+    logger.info("[APP] Starting application...")
+    pwd_executor = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+    await create_db_pool()
+    await create_tables()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close database pool and password workers on shutdown"""
+    global pwd_executor
+    if db_pool is not None:
+        db_pool.close()
+        await db_pool.wait_closed()
+    if pwd_executor is not None:
+        pwd_executor.shutdown(wait=False)
+        pwd_executor = None
 
 
 @app.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate):
     """Register new user"""
-    print(f"[API] Registration attempt for username: {user.username}, email: {user.email}")
+    logger.debug("[API] Registration attempt for username: %s, email: %s", user.username, user.email)
     
-    connection = get_db_connection()
-    cursor = connection.cursor()
+    # Hash off the event loop (and before taking a pooled connection) so other
+    # requests aren't blocked by bcrypt
+    hashed_password = await asyncio.get_running_loop().run_in_executor(
+        pwd_executor, get_password_hash, user.password
+    )
     
     try:
-        # Check if user already exists
-        cursor.execute("SELECT id FROM users WHERE username = %s OR email = %s", 
-                      (user.username, user.email))
-        existing_user = cursor.fetchone()
-        
-        if existing_user:
-            print(f"[API] Registration failed: User already exists")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username or email already registered"
-            )
+        async with get_db_pool().acquire() as connection, connection.cursor() as cursor:
+            # The UNIQUE constraints on username and email reject duplicates
+            await cursor.execute(INSERT_USER_QUERY, (user.username, user.email, hashed_password))
+            user_id = cursor.lastrowid
         
-        # Hash password and insert user
-        hashed_password = get_password_hash(user.password)
-        insert_query = """
-        INSERT INTO users (username, email, hashed_password) 
-        VALUES (%s, %s, %s)
-        """
-        cursor.execute(insert_query, (user.username, user.email, hashed_password))
-        connection.commit()
-        
-        user_id = cursor.lastrowid
         # Ensure we have a concrete integer id (cursor.lastrowid can be None or non-int)
         if user_id is None:
-            print(f"[API] Failed to retrieve inserted user ID")
+            logger.error("[API] Failed to retrieve inserted user ID")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Registration failed: could not determine user id"
             )
         user_id = int(user_id)
-        print(f"[API] User registered successfully with ID: {user_id}")
+        logger.debug("[API] User registered successfully with ID: %d", user_id)
         
-        return UserResponse(id=user_id, username=user.username, email=user.email)
+        # Response models are kept for the OpenAPI docs; returning the response
+        # directly skips FastAPI's re-validation of data we just built
+        return ORJSONResponse(
+            {"id": user_id, "username": user.username, "email": user.email},
+            status_code=status.HTTP_201_CREATED
+        )
         
+    except IntegrityError:
+        logger.info("[API] Registration failed: User already exists")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username or email already registered"
+        )
     except Error as e:
-        print(f"[API] Database error during registration: {e}")
+        logger.error("[API] Database error during registration: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed"
         )
-    finally:
-        cursor.close()
-        connection.close()
-
 
 @app.post("/login", response_model=Token)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+@limiter.limit(LOGIN_RATE_LIMIT)
+async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()):
     """Login user and return JWT token"""
-    print(f"[API] Login attempt for username: {form_data.username}")
-    
-    user = get_user_by_username(form_data.username)
+    logger.debug("[API] Login attempt for username: %s", form_data.username)
     
-    # Ensure user exists and has a hashed password before attempting to index or verify
-    if user is None:
-        print(f"[API] Login failed: User not found")
+    # Reject repeated failures before paying for a DB lookup and bcrypt
+    failed_login_key = form_data.username.casefold()
+    if failed_logins.get(failed_login_key, 0) >= MAX_FAILED_LOGINS:
+        logger.info("[API] Login rejected: too many failed attempts for %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    hashed_password = user.get("hashed_password")
+    user = await get_user_by_username(form_data.username)
+    
+    # Unknown users are still checked against a dummy hash so response time
+    # doesn't reveal which usernames exist
+    hashed_password = user.get("hashed_password") if user is not None else DUMMY_PASSWORD_HASH
     if hashed_password is None:
-        print(f"[API] Login failed: Missing stored password for user")
+        logger.error("[API] Login failed: Missing stored password for user")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Authentication failed",
         )
     
-    # Verify password (coerce to str to be safe)
-    if not verify_password(form_data.password, str(hashed_password)):
-        print(f"[API] Login failed: Invalid password")
+    # Verify password off the event loop (coerce to str to be safe)
+    password_ok = await asyncio.get_running_loop().run_in_executor(
+        pwd_executor, verify_password, form_data.password, str(hashed_password)
+    )
+    if user is None or not password_ok:
+        logger.info("[API] Login failed: %s", "User not found" if user is None else "Invalid password")
+        failed_logins[failed_login_key] = failed_logins.get(failed_login_key, 0) + 1
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    failed_logins.pop(failed_login_key, None)
+    
     # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user["username"]}, expires_delta=access_token_expires
+        data={"sub": user["username"]}, expires_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
     
-    print(f"[API] Login successful for user: {form_data.username}")
-    print(f"[API] Returning token: {access_token[:20]}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("[API] Login successful for user: %s", form_data.username)
+        logger.debug("[API] Returning token: %s...", access_token[:20])
     
-    return {"access_token": access_token, "token_type": "bearer"}
+    return ORJSONResponse({"access_token": access_token, "token_type": "bearer"})
 
 @app.get("/users/me", response_model=UserResponse)
 async def read_users_me(current_user: dict = Depends(get_current_user)):
     """Get current user information"""
-    print(f"[API] Fetching current user info for: {current_user['username']}")
-    return UserResponse(
-        id=current_user["id"],
-        username=current_user["username"],
-        email=current_user["email"]
-    )
+    logger.debug("[API] Fetching current user info for: %s", current_user["username"])
+    return ORJSONResponse({
+        "id": current_user["id"],
+        "username": current_user["username"],
+        "email": current_user["email"]
+    })
 
 @app.get("/")
 async def root():
@@ -319,5 +487,5 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    print("[APP] Starting server on http://localhost:8000")
+    logger.info("[APP] Starting server on http://localhost:8000")
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
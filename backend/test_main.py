@@ -0,0 +1,216 @@
+"""
+Backend tests for JWT handling, login throttling, the token cache and
+registration validation
+Run from the backend directory: pytest test_main.py -v
+
+The database is replaced with an in-memory user lookup so these tests
+run without MySQL.
+"""
+
+import base64
+import time
+
+import bcrypt
+import jwt
+import pytest
+from fastapi import status
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+import main
+
+# Low cost factor keeps the tests fast; checkpw reads the rounds from the hash
+BOB = {
+    "id": 1,
+    "username": "bob",
+    "email": "bob@example.com",
+    "hashed_password": bcrypt.hashpw(b"correct-password", bcrypt.gensalt(rounds=4)).decode("utf-8"),
+}
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Patch out the database and record every user lookup"""
+    calls = []
+
+    async def noop():
+        return None
+
+    async def fake_get_user_by_username(username):
+        calls.append(username)
+        # Mirror MySQL's case-insensitive collation on users.username
+        return BOB if username.casefold() == BOB["username"] else None
+
+    monkeypatch.setattr(main, "create_db_pool", noop)
+    monkeypatch.setattr(main, "create_tables", noop)
+    monkeypatch.setattr(main, "get_user_by_username", fake_get_user_by_username)
+    main.failed_logins.clear()
+    main.token_cache.clear()
+    main.limiter.reset()
+    yield calls
+    main.failed_logins.clear()
+    main.token_cache.clear()
+    main.limiter.reset()
+
+
+@pytest.fixture
+def client(lookups):
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def login(client, username, password):
+    return client.post("/login", data={"username": username, "password": password})
+
+
+def read_me(client, token):
+    return client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+
+
+class TestTokens:
+    def test_token_round_trip(self):
+        """A token from create_access_token decodes back to its claims with an integer exp"""
+        before = int(time.time())
+        token = main.create_access_token(data={"sub": "bob"}, expires_seconds=60)
+        payload = jwt.decode(
+            token, main.SECRET_KEY_BYTES, algorithms=[main.ALGORITHM], options={"require": ["exp", "sub"]}
+        )
+        assert payload["sub"] == "bob"
+        assert isinstance(payload["exp"], int)
+        assert before + 60 <= payload["exp"] <= int(time.time()) + 60
+
+    def test_login_token_grants_access(self, client):
+        response = login(client, "bob", "correct-password")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["token_type"] == "bearer"
+        assert read_me(client, response.json()["access_token"]).status_code == status.HTTP_200_OK
+
+    def test_tampered_token_rejected(self, client):
+        token = main.create_access_token(data={"sub": "bob"})
+        header, payload, signature = token.split(".")
+        forged_payload = base64.urlsafe_b64encode(b'{"sub":"admin","exp":9999999999}').rstrip(b"=").decode()
+        # Flip the first signature character; the last one partly encodes padding bits
+        flipped = ("B" if signature[0] == "A" else "A") + signature[1:]
+        for forged in (f"{header}.{forged_payload}.{signature}", f"{header}.{payload}.{flipped}"):
+            assert read_me(client, forged).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_expired_token_rejected(self, client):
+        token = main.create_access_token(data={"sub": "bob"}, expires_seconds=-10)
+        assert read_me(client, token).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_other_hmac_algorithms_not_overridden(self):
+        """Only HS256 uses the custom signer; HS384 still produces a SHA-384 signature"""
+        token = jwt.encode({"sub": "bob"}, main.SECRET_KEY_BYTES, algorithm="HS384")
+        signature = token.split(".")[2]
+        assert len(base64.urlsafe_b64decode(signature + "=" * (-len(signature) % 4))) == 48
+
+
+class TestLoginThrottling:
+    def test_rate_limit_returns_429_per_ip(self, client):
+        """The sixth login from one IP within a minute is rejected with 429"""
+        # Distinct usernames so the per-username lockout never kicks in
+        for i in range(main.MAX_FAILED_LOGINS):
+            assert login(client, f"user{i}", "wrong").status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = login(client, "another-user", "wrong")
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        # Same {"detail": ...} shape as every other error, which the frontend displays
+        assert response.json()["detail"].startswith("Too many attempts")
+
+    def test_lockout_after_failed_attempts_skips_lookup(self, client, lookups, monkeypatch):
+        """After MAX_FAILED_LOGINS failures the account is rejected before any DB or bcrypt work"""
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        for _ in range(main.MAX_FAILED_LOGINS):
+            assert login(client, "bob", "wrong").status_code == status.HTTP_401_UNAUTHORIZED
+        assert len(lookups) == main.MAX_FAILED_LOGINS
+
+        # Even the correct password is refused while locked out
+        response = login(client, "bob", "correct-password")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert len(lookups) == main.MAX_FAILED_LOGINS
+
+    def test_lockout_ignores_username_case(self, client, lookups, monkeypatch):
+        """bob, BOB and Bob share one failure budget, matching the DB collation"""
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        for username in ("bob", "BOB", "Bob", "bOb", "boB"):
+            assert login(client, username, "wrong").status_code == status.HTTP_401_UNAUTHORIZED
+
+        response = login(client, "BoB", "correct-password")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert len(lookups) == main.MAX_FAILED_LOGINS
+
+    def test_successful_login_clears_failures(self, client, monkeypatch):
+        """A successful login resets the failure count for the account"""
+        monkeypatch.setattr(main.limiter, "enabled", False)
+        for _ in range(main.MAX_FAILED_LOGINS - 1):
+            login(client, "bob", "wrong")
+
+        response = login(client, "Bob", "correct-password")
+        assert response.status_code == status.HTTP_200_OK
+        assert "bob" not in main.failed_logins
+
+
+class TestTokenCache:
+    def test_cache_hit_skips_user_lookup(self, client, lookups):
+        """A repeat /users/me call with the same token is served without touching the DB"""
+        token = main.create_access_token(data={"sub": "bob"})
+        for _ in range(2):
+            response = read_me(client, token)
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == {"id": 1, "username": "bob", "email": "bob@example.com"}
+        assert lookups == ["bob"]
+
+    def test_entry_not_served_after_token_exp(self, client, lookups, monkeypatch):
+        """An entry expires with the token's exp claim even inside the cache TTL"""
+        now = time.time()
+        token = main.create_access_token(data={"sub": "bob"}, expires_seconds=30)
+        assert read_me(client, token).status_code == status.HTTP_200_OK
+
+        monkeypatch.setattr(main.time, "time", lambda: now + 31)
+        assert token not in main.token_cache
+        # Falls through to a fresh decode; PyJWT's own clock is unpatched, so it still verifies
+        assert read_me(client, token).status_code == status.HTTP_200_OK
+        assert lookups == ["bob", "bob"]
+
+    def test_entry_not_served_after_cache_ttl(self, client, lookups, monkeypatch):
+        """Long-lived tokens are still only cached for TOKEN_CACHE_TTL_SECONDS"""
+        now = time.time()
+        token = main.create_access_token(data={"sub": "bob"}, expires_seconds=3600)
+        assert read_me(client, token).status_code == status.HTTP_200_OK
+
+        monkeypatch.setattr(main.time, "time", lambda: now + main.TOKEN_CACHE_TTL_SECONDS + 1)
+        assert read_me(client, token).status_code == status.HTTP_200_OK
+        assert lookups == ["bob", "bob"]
+
+
+class TestRegistrationValidation:
+    @pytest.mark.parametrize(
+        "email", ["test@example.com", "first.last@mail.example.co.uk", "o'brien+tag@example.com"]
+    )
+    def test_valid_email_accepted(self, email):
+        user = main.UserCreate(username="bob", email=email, password="secret")
+        assert user.email == email
+
+    @pytest.mark.parametrize(
+        "email",
+        [
+            "bad", "a@b", "a b@c.d", "a@b..c", "a@.b.c", "a@b.c.", "a@@b.c",
+            ".a@b.co", "a.@b.co", "a..b@b.co", "<x>@b.co",
+        ],
+    )
+    def test_invalid_email_rejected(self, email):
+        with pytest.raises(ValidationError):
+            main.UserCreate(username="bob", email=email, password="secret")
+
+    def test_email_length_capped_at_column_size(self):
+        """Addresses that don't fit users.email get a 422 rather than a failed INSERT"""
+        domain = "@example.com"
+        fits = "a" * (main.EMAIL_MAX_LENGTH - len(domain)) + domain
+        assert main.UserCreate(username="bob", email=fits, password="secret").email == fits
+        with pytest.raises(ValidationError):
+            main.UserCreate(username="bob", email="a" + fits, password="secret")
+
+    def test_email_domain_lowercased(self):
+        """Only the domain is normalized; the local part is kept as entered"""
+        user = main.UserCreate(username="bob", email="Bob@Example.COM", password="secret")
+        assert user.email == "Bob@example.com"